@@ -0,0 +1,68 @@
+from collections import OrderedDict
+from threading import Lock
+from typing import Any, Optional
+import time
+
+class TTLCache:
+    """Thread-safe in-process cache with per-entry expiry and LRU eviction"""
+    
+    def __init__(self, max_entries: int = 10000):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = Lock()
+    
+    def get(self, key: str) -> Optional[Any]:
+        """Get a value, or None if it is missing or expired"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+    
+    def set(self, key: str, value: Any, ttl: float):
+        """Store a value for ttl seconds"""
+        with self._lock:
+            self._entries[key] = (value, time.monotonic() + ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+    
+    def add(self, key: str, value: Any, ttl: float) -> bool:
+        """Store a value only if the key is missing or expired; return whether it was stored"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[1] > time.monotonic():
+                return False
+        
+            self._entries[key] = (value, time.monotonic() + ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            return True
+    
+    def replace(self, key: str, expected: Any, value: Any, ttl: float) -> bool:
+        """Store a value only if the key still holds expected; return whether it was stored"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[1] <= time.monotonic() or entry[0] != expected:
+                return False
+        
+            self._entries[key] = (value, time.monotonic() + ttl)
+            self._entries.move_to_end(key)
+            return True
+    
+    def delete(self, key: str, expected: Any = None):
+        """Remove a key; if expected is given, only while the key still holds it"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and (expected is None or entry[0] == expected):
+                del self._entries[key]
+    
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
@@ -22,6 +22,28 @@ class Settings(BaseSettings):
     ENVIRONMENT: str = "development"
     DEBUG: bool = True
     
+    # Production server
+    HOST: str = "0.0.0.0"
+    PORT: int = 8000
+    WEB_CONCURRENCY: int = 0  # 0 = one worker per available core
+    LOG_LEVEL: str = "info"
+    
+    # Shared state server used by production workers (set by app.server)
+    SHARED_STATE_ADDRESS: str = ""
+    SHARED_STATE_AUTHKEY: str = ""
+    
+    # Caches
+    CACHE_MAX_ENTRIES: int = 10000
+    AUTH_CACHE_SECONDS: int = 60
+    ANSWER_CACHE_SECONDS: int = 60 * 60
+    
+    # Idempotency-Key support
+    # Size for the keyed requests expected within IDEMPOTENCY_TTL_SECONDS; once full the
+    # least recently used keys are evicted early and a retry with them runs again
+    IDEMPOTENCY_MAX_KEYS: int = 100000
+    IDEMPOTENCY_TTL_SECONDS: int = 60 * 60 * 24  # How long completed responses are replayed
+    IDEMPOTENCY_LOCK_SECONDS: int = 60  # Renewed while an attempt runs; how long a crashed attempt holds its key
+    
     model_config = SettingsConfigDict(
         case_sensitive=True,
         env_file=".env"
@@ -0,0 +1,166 @@
+from fastapi import Depends, HTTPException, Request, status
+from functools import cached_property
+from supabase import Client
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.idempotency import IdempotencyStore
+from app.core.shared_state import SharedStateManager, get_shared_state
+from app.db.supabase import get_supabase_client
+from app.services.analytics_service import AnalyticsService
+from app.services.feedback_service import FeedbackService
+from app.services.llm_service import LLMService, MockLLMService
+from app.services.query_service import QueryService
+from app.services.search_service import SearchService
+from typing import Optional
+import asyncio
+
+# A failed warm-up is retried after this many seconds, doubling up to the maximum
+WARM_UP_RETRY_SECONDS = 1.0
+WARM_UP_MAX_RETRY_SECONDS = 60.0
+
+class ServiceContainer:
+    """
+    Owns the application's services for the lifetime of the app.
+
+    Nothing is built on import: each service is constructed the first time
+    it is needed, and warm_up() builds everything up front after startup so
+    the first real request does not pay for it.
+
+    Warm-up runs in two stages so requests only wait for what they use:
+    core_ready (Supabase client and caches, all that auth needs) and
+    ready (the LLM, the analytics counters and the services built on
+    them). A failed stage is retried with backoff until it succeeds.
+    """
+
+    def __init__(self):
+        self.core_ready = asyncio.Event()
+        self.ready = asyncio.Event()
+        self.warm_up_error: Optional[Exception] = None
+        self._state_changed = asyncio.Condition()
+
+    @cached_property
+    def supabase(self) -> Client:
+        return get_supabase_client()
+
+    @cached_property
+    def shared_state(self) -> Optional[SharedStateManager]:
+        # Only set under app.server, where workers share state through it
+        return get_shared_state()
+
+    @cached_property
+    def cache(self) -> TTLCache:
+        if self.shared_state:
+            return self.shared_state.cache()
+        return TTLCache(settings.CACHE_MAX_ENTRIES)
+
+    @cached_property
+    def idempotency_store(self) -> IdempotencyStore:
+        if self.shared_state:
+            return IdempotencyStore(self.shared_state.idempotency_cache())
+        return IdempotencyStore(TTLCache(settings.IDEMPOTENCY_MAX_KEYS))
+
+    @cached_property
+    def llm_service(self) -> LLMService:
+        return MockLLMService()
+
+    @cached_property
+    def analytics_service(self) -> AnalyticsService:
+        if self.shared_state:
+            return self.shared_state.analytics_service()
+        return AnalyticsService()
+
+    @cached_property
+    def search_service(self) -> SearchService:
+        return SearchService(self.supabase)
+
+    @cached_property
+    def query_service(self) -> QueryService:
+        return QueryService(
+            self.llm_service,
+            self.supabase,
+            self.analytics_service,
+            self.search_service,
+            self.cache
+        )
+
+    @cached_property
+    def feedback_service(self) -> FeedbackService:
+        return FeedbackService(self.supabase, self.analytics_service)
+
+    def _warm_up_core(self):
+        self.supabase
+        self.cache
+        self.idempotency_store
+
+    def _warm_up_services(self):
+        # Load the LLM knowledge base
+        self.llm_service
+
+        # Under app.server the analytics counters live in the shared state
+        # server, which has already loaded them once for all workers
+        if not self.shared_state:
+            self.analytics_service.rebuild()
+
+        self.query_service
+        self.feedback_service
+
+    async def _set_state(self, stage: Optional[asyncio.Event], error: Optional[Exception]):
+        async with self._state_changed:
+            if stage is not None:
+                stage.set()
+            self.warm_up_error = error
+            self._state_changed.notify_all()
+
+    async def warm_up(self):
+        """Build every service and preload the analytics counters, retrying with backoff until it works"""
+        delay = WARM_UP_RETRY_SECONDS
+        while True:
+            try:
+                if not self.core_ready.is_set():
+                    await asyncio.to_thread(self._warm_up_core)
+                    await self._set_state(self.core_ready, self.warm_up_error)
+                await asyncio.to_thread(self._warm_up_services)
+                await self._set_state(self.ready, None)
+                return
+            except Exception as e:
+                # Reported by /ready and by requests waiting for the failed stage
+                await self._set_state(None, e)
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, WARM_UP_MAX_RETRY_SECONDS)
+
+    async def wait_for(self, stage: asyncio.Event):
+        """Hold a request until a warm-up stage is done; fail it while warm-up is retrying"""
+        async with self._state_changed:
+            await self._state_changed.wait_for(lambda: stage.is_set() or self.warm_up_error is not None)
+        if not stage.is_set():
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail=f"Service is starting up, retrying after: {str(self.warm_up_error)}"
+            )
+
+async def get_services(request: Request) -> ServiceContainer:
+    return request.app.state.services
+
+async def get_supabase(services: ServiceContainer = Depends(get_services)) -> Client:
+    await services.wait_for(services.core_ready)
+    return services.supabase
+
+async def get_cache(services: ServiceContainer = Depends(get_services)) -> TTLCache:
+    await services.wait_for(services.core_ready)
+    return services.cache
+
+async def get_idempotency_store(services: ServiceContainer = Depends(get_services)) -> IdempotencyStore:
+    await services.wait_for(services.core_ready)
+    return services.idempotency_store
+
+async def get_query_service(services: ServiceContainer = Depends(get_services)) -> QueryService:
+    await services.wait_for(services.ready)
+    return services.query_service
+
+async def get_feedback_service(services: ServiceContainer = Depends(get_services)) -> FeedbackService:
+    await services.wait_for(services.ready)
+    return services.feedback_service
+
+async def get_analytics(services: ServiceContainer = Depends(get_services)) -> AnalyticsService:
+    await services.wait_for(services.ready)
+    return services.analytics_service
@@ -0,0 +1,112 @@
+from fastapi import HTTPException, status
+from app.core.cache import TTLCache
+from app.core.config import settings
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+import asyncio
+import hashlib
+import json
+import uuid
+
+# How often a retry checks whether the attempt in progress has finished
+POLL_INTERVAL_SECONDS = 0.05
+
+IN_PROGRESS = "in_progress"
+COMPLETED = "completed"
+
+def request_fingerprint(payload: Dict[str, Any]) -> str:
+    """Hash of a request body, to detect a key being reused for a different request"""
+    return hashlib.sha256(json.dumps(payload, sort_keys=True).encode()).hexdigest()
+
+class IdempotencyStore:
+    """
+    Runs an operation at most once per user and Idempotency-Key.
+
+    The first request with a key claims it and runs the operation. A retry
+    that arrives while it is running waits for it; a retry after it has
+    finished gets the stored response replayed. Failed attempts release
+    the key so the client can retry them.
+
+    The claim only lasts IDEMPOTENCY_LOCK_SECONDS, so that a crashed
+    attempt does not hold the key forever, and is renewed for as long as
+    the attempt runs. Each claim carries its own attempt ID, and the
+    attempt only ever replaces or releases its own claim.
+    """
+
+    def __init__(self, cache: TTLCache):
+        self.cache = cache
+
+    async def run(
+        self,
+        user_id: str,
+        scope: str,
+        idempotency_key: Optional[str],
+        fingerprint: str,
+        operation: Callable[[], Awaitable[Dict[str, Any]]]
+    ) -> Tuple[Dict[str, Any], bool]:
+        """
+        Run operation unless this key has already run it
+
+        Args:
+            user_id: The ID of the user making the request
+            scope: The endpoint the key applies to
+            idempotency_key: The client's Idempotency-Key header, if any
+            fingerprint: request_fingerprint() of the request body
+            operation: The work to do on the first attempt
+
+        Returns:
+            Tuple of (response, whether it was replayed)
+        """
+        if not idempotency_key:
+            return await operation(), False
+
+        # The cache is a proxy to the shared state server under app.server,
+        # so every call to it is made in a thread
+        cache_key = f"idempotency:{user_id}:{scope}:{idempotency_key}"
+        claim = {"state": IN_PROGRESS, "fingerprint": fingerprint, "attempt": uuid.uuid4().hex}
+        while True:
+            if await asyncio.to_thread(self.cache.add, cache_key, claim, settings.IDEMPOTENCY_LOCK_SECONDS):
+                break
+
+            entry = await asyncio.to_thread(self.cache.get, cache_key)
+            if entry is None:
+                # Released or expired since we tried to claim it
+                continue
+            if entry["fingerprint"] != fingerprint:
+                raise HTTPException(
+                    status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                    detail="Idempotency-Key was already used for a different request"
+                )
+            if entry["state"] == COMPLETED:
+                return entry["response"], True
+
+            await asyncio.sleep(POLL_INTERVAL_SECONDS)
+
+        heartbeat = asyncio.create_task(self._renew_claim(cache_key, claim))
+        try:
+            response = await operation()
+        except BaseException:
+            heartbeat.cancel()
+            await asyncio.to_thread(self.cache.delete, cache_key, claim)
+            raise
+        heartbeat.cancel()
+
+        await asyncio.to_thread(
+            self.cache.replace,
+            cache_key,
+            claim,
+            {"state": COMPLETED, "fingerprint": fingerprint, "response": response},
+            settings.IDEMPOTENCY_TTL_SECONDS
+        )
+        return response, False
+
+    async def _renew_claim(self, cache_key: str, claim: Dict[str, Any]):
+        """Keep claim from expiring while its attempt runs"""
+        while True:
+            await asyncio.sleep(settings.IDEMPOTENCY_LOCK_SECONDS / 3)
+            renewed = await asyncio.to_thread(
+                self.cache.replace, cache_key, claim, claim, settings.IDEMPOTENCY_LOCK_SECONDS
+            )
+            if not renewed:
+                # Expired while the event loop was stalled and claimed by a retry;
+                # that attempt owns the key now
+                return
@@ -1,19 +1,26 @@
 from fastapi import Depends, HTTPException, status, Header, Cookie
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from supabase import Client
-from app.db.supabase import get_supabase_client
+from app.core.config import settings
+from app.core.cache import TTLCache
+from app.core.container import get_cache, get_supabase
 from typing import Optional
+import asyncio
+import hashlib
 
 # Setup security scheme
 security = HTTPBearer()
 
-async def get_current_user(
+def token_cache_key(token: str) -> str:
+    """Cache key for a verified token, so raw tokens are never stored"""
+    return "auth:" + hashlib.sha256(token.encode()).hexdigest()
+
+async def get_token(
     authorization: Optional[str] = Header(None),
     supabase_auth_token: Optional[str] = Cookie(None),
-    credentials: Optional[HTTPAuthorizationCredentials] = Depends(security),
-    supabase: Client = Depends(get_supabase_client)
-):
-    """Get the current user from either the authorization header or cookie"""
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(security)
+) -> str:
+    """Get the access token from either the authorization header or cookie"""
     
     # Try to get token from different sources
     token = None
@@ -40,9 +47,23 @@ async def get_current_user(
             headers={"WWW-Authenticate": "Bearer"},
         )
     
+    return token
+
+async def get_current_user(
+    token: str = Depends(get_token),
+    supabase: Client = Depends(get_supabase),
+    cache: TTLCache = Depends(get_cache)
+):
+    """Get the current user, verifying the token with Supabase at most once per AUTH_CACHE_SECONDS"""
+    # The cache is a proxy to the shared state server under app.server, so use a thread
+    cached_user = await asyncio.to_thread(cache.get, token_cache_key(token))
+    if cached_user is not None:
+        return cached_user
+    
     try:
         # Use Supabase to verify token and get user
         user = supabase.auth.get_user(token)
+        await asyncio.to_thread(cache.set, token_cache_key(token), user.user, settings.AUTH_CACHE_SECONDS)
         return user.user
     except Exception as e:
         raise HTTPException(
@@ -0,0 +1,36 @@
+from multiprocessing.managers import BaseManager
+from app.core.config import settings
+from typing import Optional, Tuple
+
+class SharedStateManager(BaseManager):
+    """
+    Client for the state server started by app.server.
+    
+    The server owns the small shared objects: the caches and the
+    analytics counters. Every worker gets proxies
+    to them over a local socket, so workers see each other's writes and
+    cache hits. Proxy calls block, so async code makes them in a thread.
+    """
+
+for typeid in ("cache", "idempotency_cache", "analytics_service"):
+    SharedStateManager.register(typeid)
+
+shared_state: SharedStateManager = None
+
+def parse_address(address: str) -> Tuple[str, int]:
+    host, _, port = address.rpartition(":")
+    return host, int(port)
+
+def get_shared_state() -> Optional[SharedStateManager]:
+    """Connect to the shared state server, or return None when running as a single process"""
+    global shared_state
+    if not settings.SHARED_STATE_ADDRESS:
+        return None
+    if shared_state is None:
+        manager = SharedStateManager(
+            address=parse_address(settings.SHARED_STATE_ADDRESS),
+            authkey=settings.SHARED_STATE_AUTHKEY.encode()
+        )
+        manager.connect()
+        shared_state = manager
+    return shared_state
@@ -1,7 +1,8 @@
 from supabase import create_client, Client
 from app.core.config import settings
 import json
-from datetime import datetime
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterator, Optional
 
 class CustomJSONEncoder(json.JSONEncoder):
     """Handle datetime serialization for JSON responses"""
@@ -28,3 +29,35 @@ def serialize_supabase_response(data):
         return json.loads(json.dumps(data, cls=CustomJSONEncoder))
     else:
         return json.loads(json.dumps(data, cls=CustomJSONEncoder))
+
+def parse_timestamp(value: Optional[str]) -> Optional[datetime]:
+    """Parse an ISO timestamp from Supabase into a naive UTC datetime"""
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value)
+    except (TypeError, ValueError):
+        return None
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed
+
+def iter_rows(table: str, columns: str, page_size: int = 1000) -> Iterator[Dict[str, Any]]:
+    """
+    Stream a whole table one page at a time, ordered by ID.
+    
+    Pages are read by keyset (id > last seen id) rather than offset, so
+    every page costs the same however far into the table it is.
+    `columns` must include `id`.
+    """
+    client = get_supabase_client()
+    last_id = None
+    while True:
+        request = client.table(table).select(columns).order("id").limit(page_size)
+        if last_id is not None:
+            request = request.gt("id", last_id)
+        page = request.execute().data or []
+        yield from page
+        if len(page) < page_size:
+            return
+        last_id = page[-1]["id"]
@@ -1,16 +1,30 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Request, status
 from fastapi.middleware.cors import CORSMiddleware
-from app.routers import auth, queries, feedback
+from fastapi.responses import JSONResponse
+from app.routers import auth, queries, feedback, analytics
+from app.core.container import ServiceContainer
 from app.core.config import settings
+from contextlib import asynccontextmanager
+import asyncio
 import uvicorn
 from fastapi.openapi.docs import get_swagger_ui_html, get_redoc_html
 from fastapi.staticfiles import StaticFiles
 from fastapi.openapi.utils import get_openapi
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Create the service container and warm it up in the background"""
+    services = ServiceContainer()
+    app.state.services = services
+    warm_up = asyncio.create_task(services.warm_up())
+    yield
+    warm_up.cancel()
+
 # Create FastAPI app
 app = FastAPI(
     title=settings.PROJECT_NAME,
-    description="API for University Query Resolution System"
+    description="API for University Query Resolution System",
+    lifespan=lifespan
 )
 
 # Enhanced CORS configuration for frontend compatibility
@@ -27,6 +41,7 @@ app.add_middleware(
 app.include_router(auth.router, prefix="/api/auth", tags=["Authentication"])
 app.include_router(queries.router, prefix="/api/queries", tags=["Queries"])
 app.include_router(feedback.router, prefix="/api/feedback", tags=["Feedback"])
+app.include_router(analytics.router, prefix="/api/analytics", tags=["Analytics"])
 
 @app.get("/")
 async def root():
@@ -36,6 +51,23 @@ async def root():
 async def health_check():
     return {"status": "healthy"}
 
+@app.get("/ready")
+async def readiness_check(request: Request):
+    """Report whether services are built and the analytics counters are loaded"""
+    services = getattr(request.app.state, "services", None)
+    if services is not None and services.ready.is_set():
+        return {"status": "ready"}
+    if services is not None and services.warm_up_error is not None:
+        # Warm-up keeps retrying in the background
+        return JSONResponse(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            content={"status": "failed", "detail": str(services.warm_up_error)}
+        )
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"status": "starting"}
+    )
+
 @app.get("/docs", include_in_schema=False)
 async def custom_swagger_ui_html():
     return get_swagger_ui_html(
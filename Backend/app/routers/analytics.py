@@ -0,0 +1,18 @@
+from fastapi import APIRouter, Depends, Query
+from app.core.security import get_faculty_user
+from app.core.container import get_analytics
+from app.services.analytics_service import AnalyticsService
+from typing import Dict, Any
+import asyncio
+
+router = APIRouter()
+
+@router.get("", response_model=Dict[str, Any])
+async def get_dashboard_metrics(
+    days: int = Query(30, ge=0, le=366),
+    current_user = Depends(get_faculty_user),
+    analytics_service: AnalyticsService = Depends(get_analytics)
+):
+    """Get query and feedback metrics for the faculty dashboard (faculty only)"""
+    # A call to the shared state server under app.server
+    return await asyncio.to_thread(analytics_service.get_summary, days)
@@ -1,14 +1,16 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Response
 from app.models.users import UserCreate, UserResponse
-from app.db.supabase import get_supabase_client
-from app.core.security import get_current_user
+from app.core.cache import TTLCache
+from app.core.container import get_cache, get_supabase
+from app.core.security import get_current_user, get_token, token_cache_key
 from supabase import Client
 from typing import Dict, Any
+import asyncio
 
 router = APIRouter()
 
 @router.post("/register", response_model=Dict[str, str])
-async def register_user(user_data: UserCreate, supabase: Client = Depends(get_supabase_client)):
+async def register_user(user_data: UserCreate, supabase: Client = Depends(get_supabase)):
     """Register a new user (student or faculty)"""
     try:
         # Register user with Supabase Auth
@@ -51,7 +53,7 @@ async def login_user(
     response: Response,
     email: str, 
     password: str, 
-    supabase: Client = Depends(get_supabase_client)
+    supabase: Client = Depends(get_supabase)
 ):
     """Login and get authentication token"""
     try:
@@ -90,13 +92,18 @@ async def login_user(
 @router.post("/logout")
 async def logout_user(
     response: Response,
-    supabase: Client = Depends(get_supabase_client), 
-    current_user = Depends(get_current_user)
+    supabase: Client = Depends(get_supabase), 
+    current_user = Depends(get_current_user),
+    token: str = Depends(get_token),
+    cache: TTLCache = Depends(get_cache)
 ):
     """Logout the current user"""
     try:
         supabase.auth.sign_out()
         
+        # Stop accepting the cached token
+        await asyncio.to_thread(cache.delete, token_cache_key(token))
+        
         # Clear auth cookie
         response.delete_cookie(key="supabase-auth-token")
         
@@ -1,26 +1,43 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, Header, HTTPException, Response, status
 from app.models.feedback import FeedbackCreate, FeedbackResponse, FeedbackInDB
 from app.core.security import get_current_user, get_faculty_user
+from app.core.container import get_feedback_service, get_idempotency_store
+from app.core.idempotency import IdempotencyStore, request_fingerprint
 from app.services.feedback_service import FeedbackService
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 
 router = APIRouter()
 
-# Initialize services
-feedback_service = FeedbackService()
-
 @router.post("/flag-response", response_model=Dict[str, Any])
-async def flag_response(feedback: FeedbackCreate, current_user = Depends(get_current_user)):
-    """Flag a query response as incorrect and provide feedback"""
-    result = await feedback_service.flag_response(
-        feedback.query_id,
-        current_user.id, 
-        feedback.feedback_text
+async def flag_response(
+    feedback: FeedbackCreate,
+    response: Response,
+    idempotency_key: Optional[str] = Header(None),
+    current_user = Depends(get_current_user),
+    feedback_service: FeedbackService = Depends(get_feedback_service),
+    idempotency_store: IdempotencyStore = Depends(get_idempotency_store)
+):
+    """Flag a query response as incorrect and provide feedback. Retries with the same Idempotency-Key replay the first response."""
+    result, replayed = await idempotency_store.run(
+        current_user.id,
+        "flag_response",
+        idempotency_key,
+        request_fingerprint(feedback.model_dump()),
+        lambda: feedback_service.flag_response(
+            feedback.query_id,
+            current_user.id, 
+            feedback.feedback_text
+        )
     )
+    if replayed:
+        response.headers["Idempotent-Replayed"] = "true"
     return result
 
 @router.get("/pending", response_model=List[Dict[str, Any]])
-async def get_pending_feedback(current_user = Depends(get_faculty_user)):
+async def get_pending_feedback(
+    current_user = Depends(get_faculty_user),
+    feedback_service: FeedbackService = Depends(get_feedback_service)
+):
     """Get all pending feedback that needs faculty response (faculty only)"""
     feedback_items = await feedback_service.get_pending_feedback()
     return feedback_items
@@ -29,7 +46,8 @@ async def get_pending_feedback(current_user = Depends(get_faculty_user)):
 async def respond_to_feedback(
     feedback_id: str,
     response: FeedbackResponse, 
-    current_user = Depends(get_faculty_user)
+    current_user = Depends(get_faculty_user),
+    feedback_service: FeedbackService = Depends(get_feedback_service)
 ):
     """Respond to a student's feedback (faculty only)"""
     result = await feedback_service.respond_to_feedback(
@@ -1,30 +1,79 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response, status
 from app.models.queries import QueryCreate, QueryInDB
-from app.core.security import get_current_user
-from app.services.llm_service import MockLLMService
+from app.core.security import get_current_user, get_faculty_user
+from app.core.container import get_query_service, get_idempotency_store
+from app.core.idempotency import IdempotencyStore, request_fingerprint
 from app.services.query_service import QueryService
-from typing import List, Dict, Any
+from datetime import date
+from typing import List, Dict, Any, Optional
 
 router = APIRouter()
 
-# Initialize services
-llm_service = MockLLMService()
-query_service = QueryService(llm_service)
-
 @router.post("/submit", response_model=Dict[str, Any])
-async def submit_query(query: QueryCreate, current_user = Depends(get_current_user)):
-    """Submit a new query and get a response"""
-    result = await query_service.submit_query(current_user.id, query.query_text)
+async def submit_query(
+    query: QueryCreate,
+    response: Response,
+    idempotency_key: Optional[str] = Header(None),
+    current_user = Depends(get_current_user),
+    query_service: QueryService = Depends(get_query_service),
+    idempotency_store: IdempotencyStore = Depends(get_idempotency_store)
+):
+    """Submit a new query and get a response. Retries with the same Idempotency-Key replay the first response."""
+    result, replayed = await idempotency_store.run(
+        current_user.id,
+        "submit_query",
+        idempotency_key,
+        request_fingerprint(query.model_dump()),
+        lambda: query_service.submit_query(current_user.id, query.query_text)
+    )
+    if replayed:
+        response.headers["Idempotent-Replayed"] = "true"
     return result
 
 @router.get("/history", response_model=List[Dict[str, Any]])
-async def get_query_history(current_user = Depends(get_current_user)):
+async def get_query_history(
+    current_user = Depends(get_current_user),
+    query_service: QueryService = Depends(get_query_service)
+):
     """Get the query history for the current user"""
     queries = await query_service.get_user_queries(current_user.id)
     return queries
 
+@router.get("/search", response_model=Dict[str, Any])
+async def search_queries(
+    q: str = Query(..., min_length=1),
+    query_status: Optional[str] = Query(None, alias="status"),
+    created_from: Optional[date] = None,
+    created_to: Optional[date] = None,
+    max_confidence: Optional[float] = Query(None, ge=0, le=1),
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None,
+    current_user = Depends(get_faculty_user),
+    query_service: QueryService = Depends(get_query_service)
+):
+    """Search past queries, answers and faculty responses (faculty only)"""
+    try:
+        return await query_service.search_queries(
+            q,
+            status=query_status,
+            created_from=created_from,
+            created_to=created_to,
+            max_confidence=max_confidence,
+            limit=limit,
+            cursor=cursor
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+
 @router.get("/{query_id}", response_model=Dict[str, Any])
-async def get_query(query_id: str, current_user = Depends(get_current_user)):
+async def get_query(
+    query_id: str,
+    current_user = Depends(get_current_user),
+    query_service: QueryService = Depends(get_query_service)
+):
     """Get a specific query by ID"""
     query = await query_service.get_query_by_id(query_id)
     
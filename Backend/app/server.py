@@ -0,0 +1,110 @@
+"""
+Production entry point: python -m app.server
+
+Starts the shared state server, preloads the analytics counters into it once,
+then runs one uvicorn worker per available core. Workers reach the shared
+caches and analytics over a local socket. The search index lives in Postgres,
+so it is built once and shared by every worker without being loaded here.
+"""
+from multiprocessing.managers import BaseManager
+from uvicorn.supervisors import Multiprocess
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.services.analytics_service import AnalyticsService
+import os
+import secrets
+import socket
+import uvicorn
+
+_cache: TTLCache = None
+_idempotency_cache: TTLCache = None
+_analytics_service: AnalyticsService = None
+
+def _get_cache() -> TTLCache:
+    return _cache
+
+def _get_idempotency_cache() -> TTLCache:
+    return _idempotency_cache
+
+def _get_analytics_service() -> AnalyticsService:
+    return _analytics_service
+
+def _preload():
+    """Build the shared objects inside the state server process"""
+    global _cache, _idempotency_cache, _analytics_service
+    _cache = TTLCache(settings.CACHE_MAX_ENTRIES)
+    _idempotency_cache = TTLCache(settings.IDEMPOTENCY_MAX_KEYS)
+    _analytics_service = AnalyticsService()
+    _analytics_service.rebuild()
+
+class SharedStateServer(BaseManager):
+    """Owns the objects that app.core.shared_state.SharedStateManager proxies"""
+
+SharedStateServer.register("cache", callable=_get_cache)
+SharedStateServer.register("idempotency_cache", callable=_get_idempotency_cache)
+SharedStateServer.register("analytics_service", callable=_get_analytics_service)
+
+def worker_count() -> int:
+    """WEB_CONCURRENCY if set, otherwise the number of cores this process may run on"""
+    if settings.WEB_CONCURRENCY > 0:
+        return settings.WEB_CONCURRENCY
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+def start_shared_state_server() -> SharedStateServer:
+    """Start the state server on a free local port and point workers at it"""
+    authkey = secrets.token_hex(16)
+    server = SharedStateServer(address=("127.0.0.1", 0), authkey=authkey.encode())
+    try:
+        server.start(initializer=_preload)
+    except EOFError:
+        # The server process exits before handing over its address if _preload raises
+        raise RuntimeError(
+            "Shared state server failed to start while loading the analytics counters; "
+            "check the Supabase settings and the traceback above"
+        ) from None
+
+    # Workers inherit the environment and read these through Settings
+    host, port = server.address
+    os.environ["SHARED_STATE_ADDRESS"] = f"{host}:{port}"
+    os.environ["SHARED_STATE_AUTHKEY"] = authkey
+    return server
+
+class WorkerConfig(uvicorn.Config):
+    """uvicorn.Config whose shared listening socket hands out TCP_NODELAY connections"""
+
+    def bind_socket(self) -> socket.socket:
+        sock = super().bind_socket()
+        # uvicorn creates the socket with protocol 0, and asyncio only sets TCP_NODELAY
+        # on connections accepted from a socket created with IPPROTO_TCP. Without it,
+        # Nagle's algorithm holds back the end of each response until the client's
+        # delayed ACK, adding ~40 ms to every keep-alive request once workers > 1.
+        if sock.family in (socket.AF_INET, socket.AF_INET6) and sock.proto != socket.IPPROTO_TCP:
+            sock = socket.socket(sock.family, sock.type, socket.IPPROTO_TCP, fileno=sock.detach())
+        return sock
+
+def run_workers(workers: int):
+    """What uvicorn.run does, with WorkerConfig's socket for multiple workers"""
+    config = WorkerConfig(
+        "app.main:app",
+        host=settings.HOST,
+        port=settings.PORT,
+        workers=workers,
+        log_level=settings.LOG_LEVEL
+    )
+    server = uvicorn.Server(config)
+    if config.workers > 1:
+        Multiprocess(config, target=server.run, sockets=[config.bind_socket()]).run()
+    else:
+        server.run()
+
+def main():
+    server = start_shared_state_server()
+    try:
+        run_workers(worker_count())
+    finally:
+        server.shutdown()
+
+if __name__ == "__main__":
+    main()
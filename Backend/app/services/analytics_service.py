@@ -0,0 +1,211 @@
+from app.db.supabase import iter_rows, parse_timestamp
+from bisect import insort
+from collections import defaultdict
+from threading import Lock
+from typing import Dict, Any, List, Optional, Set
+
+# Number of equal-width confidence buckets between 0.0 and 1.0
+CONFIDENCE_BUCKETS = 10
+
+# How many of the most recent days keep daily counts
+DAILY_HISTORY_DAYS = 366
+
+# Upper bounds (in seconds) of the time-to-resolution histogram buckets
+RESOLUTION_BUCKETS = [
+    ("<1h", 60 * 60),
+    ("1h-1d", 60 * 60 * 24),
+    ("1d-7d", 60 * 60 * 24 * 7),
+    (">7d", None),
+]
+
+
+def _day_key(value: Optional[str]) -> Optional[str]:
+    """Get the YYYY-MM-DD day a timestamp falls on"""
+    parsed = parse_timestamp(value)
+    return parsed.date().isoformat() if parsed else None
+
+
+def _confidence_bucket(score: float) -> int:
+    index = int(score * CONFIDENCE_BUCKETS)
+    return max(0, min(index, CONFIDENCE_BUCKETS - 1))
+
+
+def _resolution_bucket(seconds: float) -> str:
+    for label, upper_bound in RESOLUTION_BUCKETS:
+        if upper_bound is None or seconds < upper_bound:
+            return label
+    return RESOLUTION_BUCKETS[-1][0]
+
+
+class AnalyticsService:
+    """
+    Rolling counters for the faculty dashboard.
+
+    Counters are rebuilt from the `queries` and `feedback` tables once on
+    startup and then kept up to date by QueryService and FeedbackService,
+    so reads never have to scan the tables.
+    """
+
+    def __init__(self):
+        self._lock = Lock()
+        self.reset()
+
+    def reset(self):
+        """Clear all counters"""
+        with self._lock:
+            self.total_queries = 0
+            self.status_counts: Dict[str, int] = defaultdict(int)
+            self.confidence_sum = 0.0
+            self.confidence_count = 0
+            self.confidence_histogram = [0] * CONFIDENCE_BUCKETS
+            self.total_feedback = 0
+            self.feedback_status_counts: Dict[str, int] = defaultdict(int)
+            self.resolution_seconds_sum = 0.0
+            self.resolution_count = 0
+            self.resolution_histogram: Dict[str, int] = {label: 0 for label, _ in RESOLUTION_BUCKETS}
+            # Day buckets and their keys in date order, so reads never sort
+            self.daily: Dict[str, Dict[str, int]] = {}
+            self.days: List[str] = []
+            # Queries are stored as answered, so only queries in another
+            # status are tracked by ID; any other query is known to be answered.
+            # Pending feedback is tracked so responses are not counted twice.
+            self.query_statuses: Dict[str, str] = {}
+            self.pending_feedback_ids: Set[str] = set()
+
+    def rebuild(self):
+        """Recompute all counters from storage"""
+        self.reset()
+
+        for query in iter_rows("queries", "id, status, confidence_score, created_at"):
+            self.record_query(query)
+
+        for feedback in iter_rows("feedback", "id, query_id, status, created_at, updated_at"):
+            self._record_feedback(feedback)
+
+    def record_query(self, query: Dict[str, Any]):
+        """Count a newly stored query"""
+        status = query.get("status") or "pending"
+        confidence = query.get("confidence_score")
+        day = _day_key(query.get("created_at"))
+
+        with self._lock:
+            self.total_queries += 1
+            self.status_counts[status] += 1
+            if status != "answered" and query.get("id"):
+                self.query_statuses[query["id"]] = status
+            if confidence is not None:
+                self.confidence_sum += confidence
+                self.confidence_count += 1
+                self.confidence_histogram[_confidence_bucket(confidence)] += 1
+            counts = self._day_counts(day)
+            if counts:
+                counts["queries"] += 1
+
+    def record_flag(self, query_id: str, feedback: Dict[str, Any]):
+        """Count a newly flagged response and its feedback entry"""
+        with self._lock:
+            previous_status = self.query_statuses.get(query_id, "answered")
+            if previous_status != "flagged":
+                self.query_statuses[query_id] = "flagged"
+                self.status_counts[previous_status] -= 1
+                self.status_counts["flagged"] += 1
+
+        self._record_feedback(feedback)
+
+    def record_resolution(self, feedback: Dict[str, Any]):
+        """Count a faculty response to pending feedback"""
+        with self._lock:
+            feedback_id = feedback.get("id")
+            if feedback_id not in self.pending_feedback_ids:
+                # Already addressed, or unknown to this process
+                return
+            self.pending_feedback_ids.discard(feedback_id)
+            self.feedback_status_counts["pending"] -= 1
+            self.feedback_status_counts["addressed"] += 1
+            self._count_resolution(feedback)
+
+    def _record_feedback(self, feedback: Dict[str, Any]):
+        status = feedback.get("status") or "pending"
+        day = _day_key(feedback.get("created_at"))
+
+        with self._lock:
+            self.total_feedback += 1
+            self.feedback_status_counts[status] += 1
+            counts = self._day_counts(day)
+            if counts:
+                counts["flags"] += 1
+            if status == "pending":
+                if feedback.get("id"):
+                    self.pending_feedback_ids.add(feedback["id"])
+            elif status == "addressed":
+                self._count_resolution(feedback)
+
+    def _count_resolution(self, feedback: Dict[str, Any]):
+        """Add a resolved feedback entry to the resolution counters (lock held)"""
+        created_at = parse_timestamp(feedback.get("created_at"))
+        resolved_at = parse_timestamp(feedback.get("updated_at"))
+        if not created_at or not resolved_at:
+            return
+
+        seconds = max((resolved_at - created_at).total_seconds(), 0.0)
+        self.resolution_seconds_sum += seconds
+        self.resolution_count += 1
+        self.resolution_histogram[_resolution_bucket(seconds)] += 1
+        counts = self._day_counts(resolved_at.date().isoformat())
+        if counts:
+            counts["resolved"] += 1
+
+    def _day_counts(self, day: Optional[str]) -> Optional[Dict[str, int]]:
+        """
+        Get the counters of a day, adding it in date order (lock held)
+
+        Only the newest DAILY_HISTORY_DAYS days are kept; None for days older than that.
+        """
+        if not day:
+            return None
+        counts = self.daily.get(day)
+        if counts is not None:
+            return counts
+        if len(self.days) >= DAILY_HISTORY_DAYS and day < self.days[0]:
+            return None
+
+        # New days almost always sort last; only a rebuild inserts older ones
+        counts = self.daily[day] = {"queries": 0, "flags": 0, "resolved": 0}
+        insort(self.days, day)
+        if len(self.days) > DAILY_HISTORY_DAYS:
+            del self.daily[self.days.pop(0)]
+        return counts
+
+    def get_summary(self, days: int = 30) -> Dict[str, Any]:
+        """
+        Get the dashboard metrics
+
+        Args:
+            days: How many of the most recent days to include in the daily breakdown
+
+        Returns:
+            A dictionary of counters and histograms
+        """
+        with self._lock:
+            flagged = self.status_counts.get("flagged", 0)
+            recent_days = self.days[-days:] if days > 0 else []
+
+            return {
+                "total_queries": self.total_queries,
+                "queries_by_status": dict(self.status_counts),
+                "flag_rate": flagged / self.total_queries if self.total_queries else 0.0,
+                "average_confidence": (
+                    self.confidence_sum / self.confidence_count if self.confidence_count else None
+                ),
+                "confidence_histogram": {
+                    f"{i / CONFIDENCE_BUCKETS:.1f}-{(i + 1) / CONFIDENCE_BUCKETS:.1f}": count
+                    for i, count in enumerate(self.confidence_histogram)
+                },
+                "total_feedback": self.total_feedback,
+                "feedback_by_status": dict(self.feedback_status_counts),
+                "average_resolution_seconds": (
+                    self.resolution_seconds_sum / self.resolution_count if self.resolution_count else None
+                ),
+                "resolution_histogram": dict(self.resolution_histogram),
+                "daily": [{"date": day, **self.daily[day]} for day in recent_days],
+            }
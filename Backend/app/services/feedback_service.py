@@ -1,10 +1,18 @@
-from app.db.supabase import get_supabase_client, serialize_supabase_response
+from supabase import Client
+from app.db.supabase import serialize_supabase_response
+from app.services.analytics_service import AnalyticsService
 from datetime import datetime
 from typing import Dict, Any, List, Optional
+import asyncio
 
 class FeedbackService:
-    def __init__(self):
-        self.supabase = get_supabase_client()
+    def __init__(
+        self,
+        supabase: Client,
+        analytics_service: AnalyticsService
+    ):
+        self.supabase = supabase
+        self.analytics_service = analytics_service
     
     async def flag_response(self, query_id: str, student_id: str, feedback_text: str) -> Dict[str, Any]:
         """
@@ -40,6 +48,10 @@ class FeedbackService:
         # Format for frontend consumption
         if result.data and len(result.data) > 0:
             feedback = result.data[0]
+            
+            # Keep dashboard counters current (a call to the shared state server under app.server)
+            await asyncio.to_thread(self.analytics_service.record_flag, query_id, feedback)
+            
             return {
                 "id": feedback.get("id"),
                 "query_id": feedback.get("query_id"),
@@ -122,6 +134,9 @@ class FeedbackService:
         # Get the query to update its status
         query_id = feedback.data.get("query_id")
         
+        # Keep dashboard counters current (a call to the shared state server under app.server)
+        await asyncio.to_thread(self.analytics_service.record_resolution, feedback.data)
+        
         # Update the original query's updated_at time
         self.supabase.table("queries").update({
             "updated_at": now
@@ -1,12 +1,39 @@
+from supabase import Client
 from app.services.llm_service import LLMService
-from app.db.supabase import get_supabase_client, serialize_supabase_response
-from datetime import datetime
-from typing import Dict, Any, List
+from app.services.analytics_service import AnalyticsService
+from app.services.search_service import SearchService
+from app.db.supabase import serialize_supabase_response
+from app.core.cache import TTLCache
+from app.core.config import settings
+from datetime import datetime, date
+from typing import Dict, Any, List, Optional, Tuple
+import asyncio
 
 class QueryService:
-    def __init__(self, llm_service: LLMService):
+    def __init__(
+        self,
+        llm_service: LLMService,
+        supabase: Client,
+        analytics_service: AnalyticsService,
+        search_service: SearchService,
+        cache: TTLCache
+    ):
         self.llm_service = llm_service
-        self.supabase = get_supabase_client()
+        self.supabase = supabase
+        self.analytics_service = analytics_service
+        self.search_service = search_service
+        self.cache = cache
+    
+    def get_answer(self, query_text: str) -> Tuple[str, float]:
+        """Get the LLM answer for a query, reusing answers to identical questions"""
+        cache_key = "answer:" + " ".join(query_text.lower().split())
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            return cached
+        
+        answer = self.llm_service.get_response(query_text)
+        self.cache.set(cache_key, answer, settings.ANSWER_CACHE_SECONDS)
+        return answer
     
     async def submit_query(self, user_id: str, query_text: str) -> Dict[str, Any]:
         """
@@ -19,8 +46,8 @@ class QueryService:
         Returns:
             A dictionary with the query and response details
         """
-        # Get response from LLM
-        response_text, confidence = self.llm_service.get_response(query_text)
+        # Get response from LLM (the answer cache may be a proxy to the shared state server)
+        response_text, confidence = await asyncio.to_thread(self.get_answer, query_text)
         
         # Create query data
         now = datetime.now().isoformat()
@@ -40,6 +67,10 @@ class QueryService:
         # Extract the inserted record and format for frontend
         query_record = result.data[0] if result.data else {}
         
+        # Keep dashboard counters current; the database keeps the search index current
+        stored_query = {**query_data, "id": query_record.get("id")}
+        await asyncio.to_thread(self.analytics_service.record_query, stored_query)
+        
         # Format response for frontend consumption
         return {
             "id": query_record.get("id"),
@@ -100,3 +131,45 @@ class QueryService:
         }
         
         return formatted_query
+    
+    async def search_queries(
+        self,
+        text: str,
+        status: Optional[str] = None,
+        created_from: Optional[date] = None,
+        created_to: Optional[date] = None,
+        max_confidence: Optional[float] = None,
+        limit: int = 20,
+        cursor: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Full-text search over queries, answers and faculty responses"""
+        # The Supabase client blocks, so keep the call off the event loop
+        found = await asyncio.to_thread(
+            self.search_service.search,
+            text,
+            status=status,
+            created_from=created_from,
+            created_to=created_to,
+            max_confidence=max_confidence,
+            limit=limit,
+            cursor=cursor
+        )
+        
+        results = []
+        for query in found["hits"]:
+            results.append({
+                "id": query.get("id"),
+                "query_text": query.get("query_text"),
+                "response": {
+                    "response_text": query.get("response_text"),
+                    "confidence_score": query.get("confidence_score")
+                },
+                "faculty_responses": query.get("faculty_responses") or [],
+                "status": query.get("status"),
+                "created_at": query.get("created_at"),
+                "updated_at": query.get("updated_at"),
+                "user_id": query.get("user_id"),
+                "score": query.get("rank")
+            })
+        
+        return {"results": results, "next_cursor": found["next_cursor"]}
@@ -0,0 +1,80 @@
+from supabase import Client
+from datetime import date
+from typing import Dict, Any, Optional, Tuple
+import base64
+import json
+
+
+def encode_cursor(score: float, query_id: str) -> str:
+    payload = json.dumps({"score": score, "id": query_id})
+    return base64.urlsafe_b64encode(payload.encode()).decode()
+
+
+def decode_cursor(cursor: str) -> Tuple[float, str]:
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return float(payload["score"]), str(payload["id"])
+    except (ValueError, TypeError, KeyError):
+        raise ValueError("Invalid cursor")
+
+
+class SearchService:
+    """
+    Full-text search over queries, answers and faculty responses.
+
+    The index lives in Postgres (supabase/migrations/*_query_search.sql):
+    a tsvector per query kept current by triggers, a GIN index over it and
+    a search_queries() function that ranks matches with ts_rank and pages
+    through them by (rank, id). Nothing is loaded into or kept in the
+    API process, so every worker searches the same index.
+    """
+
+    def __init__(self, supabase: Client):
+        self.supabase = supabase
+
+    def search(
+        self,
+        text: str,
+        status: Optional[str] = None,
+        created_from: Optional[date] = None,
+        created_to: Optional[date] = None,
+        max_confidence: Optional[float] = None,
+        limit: int = 20,
+        cursor: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """
+        Search queries, answers and faculty responses
+
+        Args:
+            text: The search text
+            status: Only return queries with this status
+            created_from: Only return queries created on or after this day
+            created_to: Only return queries created on or before this day
+            max_confidence: Only return queries answered with a confidence below this
+            limit: The maximum number of results to return
+            cursor: The next_cursor of the previous page
+
+        Returns:
+            The ranked query rows, each with its faculty responses and rank, and the cursor for the next page, if any
+        """
+        after_rank, after_id = decode_cursor(cursor) if cursor else (None, None)
+
+        # One extra row tells whether there is a next page
+        result = self.supabase.rpc("search_queries", {
+            "search_text": text,
+            "query_status": status,
+            "created_from": created_from.isoformat() if created_from else None,
+            "created_to": created_to.isoformat() if created_to else None,
+            "max_confidence": max_confidence,
+            "after_rank": after_rank,
+            "after_id": after_id,
+            "page_size": limit + 1,
+        }).execute()
+        rows = result.data or []
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_cursor(rows[-1]["rank"], rows[-1]["id"])
+
+        return {"hits": rows, "next_cursor": next_cursor}
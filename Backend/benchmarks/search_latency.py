@@ -0,0 +1,56 @@
+"""
+Search latency against the Postgres full-text index.
+
+Seed a scratch Supabase project first (see benchmarks/search_seed.sql), point
+.env at it, then from the Backend directory:
+    python benchmarks/search_latency.py --repeat 20
+
+Each search fetches one page of 20 results, as one API request does. The
+first search is also followed to its second page through the cursor.
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+from datetime import date
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.db.supabase import get_supabase_client
+from app.services.search_service import SearchService
+
+SEARCHES = [
+    ("information", {}),
+    ("department details", {}),
+    ("tuition deadline", {}),
+    ("parking permit refund", {}),
+    ("information", {"max_confidence": 0.5, "status": "answered"}),
+    ("scholarship", {"status": "flagged"}),
+    ("housing", {"created_from": date.today().replace(day=1)}),
+]
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    service = SearchService(get_supabase_client())
+    print(f"{'search':<28} {'filters':<48} {'p50 ms':>7} {'p95 ms':>7}")
+    for text, filters in SEARCHES:
+        timings = []
+        for _ in range(args.repeat):
+            started = time.perf_counter()
+            service.search(text, limit=20, **filters)
+            timings.append((time.perf_counter() - started) * 1000)
+        timings.sort()
+        print(f"{text:<28} {str(filters):<48} {statistics.median(timings):>7.2f} {timings[int(len(timings) * 0.95) - 1]:>7.2f}")
+
+    first = service.search(SEARCHES[0][0], limit=20)
+    if first["next_cursor"]:
+        started = time.perf_counter()
+        service.search(SEARCHES[0][0], limit=20, cursor=first["next_cursor"])
+        print(f"second page of {SEARCHES[0][0]!r}: {(time.perf_counter() - started) * 1000:.2f} ms")
+
+if __name__ == "__main__":
+    main()
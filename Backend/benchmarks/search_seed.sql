@@ -0,0 +1,27 @@
+-- Seed synthetic queries for benchmarks/search_latency.py. Use a scratch project.
+--
+--   psql "$DATABASE_URL" -v rows=1000000 -v user_id="'<an existing user id>'" -f benchmarks/search_seed.sql
+--
+-- Every row gets the mock LLM's default answer, so terms like "information"
+-- and "department" match nearly every row, which is the worst case for ranking.
+
+insert into queries (user_id, query_text, response_text, confidence_score, status, created_at, updated_at)
+select
+    :user_id,
+    (
+        select string_agg(
+            (array['tuition', 'deadline', 'library', 'parking', 'housing', 'refund', 'advisor', 'exam',
+                   'permit', 'registration', 'transcript', 'scholarship', 'financial', 'aid', 'course',
+                   'schedule', 'graduation', 'dorm', 'meal', 'plan', 'counseling', 'career', 'visa', 'fees'])[1 + floor(random() * 24)::int],
+            ' '
+        )
+        from generate_series(1, 3 + (g % 8))
+    ),
+    'I don''t have information about that specific topic yet. Please contact your department for more details.',
+    0.3,
+    case when random() < 0.02 then 'flagged' else 'answered' end,
+    now() - (g % 365) * interval '1 day',
+    now()
+from generate_series(1, :rows) g;
+
+analyze queries;
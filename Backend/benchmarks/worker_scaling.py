@@ -0,0 +1,89 @@
+"""
+Throughput of the production server (app.server) by worker count.
+
+Usage, from the Backend directory:
+    python benchmarks/worker_scaling.py --workers 1 2 4 --path /health
+
+For authenticated endpoints pass --token with a valid access token, e.g.
+    python benchmarks/worker_scaling.py --path "/api/queries/search?q=tuition" --token ...
+
+The clients run on the same machine, so scaling only shows with spare cores:
+run it on a host with at least twice as many cores as the most workers tested.
+"""
+from multiprocessing import Pool
+import argparse
+import os
+import subprocess
+import sys
+import time
+import httpx
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def run_client(args):
+    """Send requests back to back for duration seconds and count the successes"""
+    url, token, duration = args
+    headers = {"Authorization": f"Bearer {token}"} if token else {}
+    completed = 0
+    with httpx.Client(headers=headers) as client:
+        deadline = time.monotonic() + duration
+        while time.monotonic() < deadline:
+            if client.get(url).status_code == 200:
+                completed += 1
+    return completed
+
+def wait_until_ready(base_url: str, timeout: float = 60):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            # /health answers as soon as a worker is up; /ready waits for warm-up
+            if httpx.get(f"{base_url}/ready").status_code == 200:
+                return
+        except httpx.TransportError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError("Server did not become ready")
+
+def measure(workers: int, port: int, path: str, token: str, clients: int, duration: float) -> float:
+    env = {**os.environ, "WEB_CONCURRENCY": str(workers), "PORT": str(port), "DEBUG": "false"}
+    server = subprocess.Popen(
+        [sys.executable, "-m", "app.server"],
+        cwd=BACKEND_DIR,
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL
+    )
+    try:
+        base_url = f"http://127.0.0.1:{port}"
+        wait_until_ready(base_url)
+        with Pool(clients) as pool:
+            counts = pool.map(run_client, [(base_url + path, token, duration)] * clients)
+        return sum(counts) / duration
+    finally:
+        server.terminate()
+        server.wait()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--path", default="/health")
+    parser.add_argument("--token", default="")
+    parser.add_argument("--clients", type=int, default=(os.cpu_count() or 1) * 2)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    cores = len(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else os.cpu_count()
+    print(f"{cores} cores available to the server and the {args.clients} client processes")
+    if cores < 2 * max(args.workers):
+        print("warning: too few cores for the workers and clients to run in parallel")
+
+    baseline = None
+    print(f"{'workers':>8} {'req/s':>10} {'speedup':>8}")
+    for workers in args.workers:
+        throughput = measure(workers, args.port, args.path, args.token, args.clients, args.duration)
+        baseline = baseline or throughput
+        print(f"{workers:>8} {throughput:>10.1f} {throughput / baseline:>7.2f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+-- Full-text search over queries, their answers and faculty responses.
+--
+-- Every query keeps a tsvector of its text, its answer and the faculty
+-- responses to its feedback. Triggers keep it current and a GIN index
+-- serves the match, so the API never scans or caches the tables itself.
+-- search_queries() ranks the matches with ts_rank and pages through them
+-- by (rank, id), so every page costs the same however deep it is.
+
+create or replace function query_search_vector(
+    vector_query_id queries.id%type,
+    vector_query_text text,
+    vector_response_text text
+)
+returns tsvector
+language sql
+stable
+as $$
+    select setweight(to_tsvector('english', coalesce(vector_query_text, '')), 'A')
+        || setweight(to_tsvector('english', coalesce(vector_response_text, '')), 'B')
+        || setweight(to_tsvector('english', coalesce((
+            select string_agg(f.faculty_response, ' ')
+            from feedback f
+            where f.query_id = vector_query_id
+        ), '')), 'A')
+$$;
+
+alter table queries add column if not exists search_vector tsvector;
+
+update queries q
+set search_vector = query_search_vector(q.id, q.query_text, q.response_text);
+
+create index if not exists queries_search_vector_idx on queries using gin (search_vector);
+
+create or replace function queries_search_vector_trigger()
+returns trigger
+language plpgsql
+as $$
+begin
+    new.search_vector := query_search_vector(new.id, new.query_text, new.response_text);
+    return new;
+end
+$$;
+
+drop trigger if exists queries_search_vector on queries;
+create trigger queries_search_vector
+    before insert or update of query_text, response_text on queries
+    for each row execute function queries_search_vector_trigger();
+
+-- A faculty response changes the vector of the query it answers
+create or replace function feedback_search_vector_trigger()
+returns trigger
+language plpgsql
+as $$
+declare
+    changed_query_id queries.id%type;
+begin
+    if tg_op = 'DELETE' then
+        changed_query_id := old.query_id;
+    else
+        changed_query_id := new.query_id;
+    end if;
+
+    update queries q
+    set search_vector = query_search_vector(q.id, q.query_text, q.response_text)
+    where q.id = changed_query_id;
+    return null;
+end
+$$;
+
+drop trigger if exists feedback_search_vector on feedback;
+create trigger feedback_search_vector
+    after insert or delete or update of faculty_response on feedback
+    for each row execute function feedback_search_vector_trigger();
+
+-- Any search term may match; queries matching more of them rank higher
+create or replace function search_queries(
+    search_text text,
+    query_status text default null,
+    created_from date default null,
+    created_to date default null,
+    max_confidence double precision default null,
+    after_rank real default null,
+    after_id queries.id%type default null,
+    page_size integer default 20
+)
+returns table (
+    id queries.id%type,
+    query_text queries.query_text%type,
+    response_text queries.response_text%type,
+    confidence_score queries.confidence_score%type,
+    status queries.status%type,
+    created_at queries.created_at%type,
+    updated_at queries.updated_at%type,
+    user_id queries.user_id%type,
+    faculty_responses text[],
+    rank real
+)
+language sql
+stable
+as $$
+    with search as (
+        select nullif(replace(plainto_tsquery('english', search_text)::text, '&', '|'), '')::tsquery as terms
+    ),
+    page as (
+        select q.*, ts_rank(q.search_vector, s.terms) as rank
+        from queries q, search s
+        where q.search_vector @@ s.terms
+            and (query_status is null or q.status = query_status)
+            and (created_from is null or q.created_at >= created_from)
+            and (created_to is null or q.created_at < created_to + 1)
+            and (max_confidence is null or q.confidence_score < max_confidence)
+            and (
+                after_rank is null
+                or ts_rank(q.search_vector, s.terms) < after_rank
+                or (ts_rank(q.search_vector, s.terms) = after_rank and q.id > after_id)
+            )
+        order by rank desc, q.id
+        limit page_size
+    )
+    select
+        p.id,
+        p.query_text,
+        p.response_text,
+        p.confidence_score,
+        p.status,
+        p.created_at,
+        p.updated_at,
+        p.user_id,
+        array(
+            select f.faculty_response
+            from feedback f
+            where f.query_id = p.id and f.faculty_response is not null
+            order by f.updated_at
+        ),
+        p.rank
+    from page p
+    order by p.rank desc, p.id
+$$;
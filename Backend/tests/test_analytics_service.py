@@ -0,0 +1,60 @@
+from app.services import analytics_service
+from app.services.analytics_service import AnalyticsService
+
+def make_service():
+    service = AnalyticsService()
+    service.reset()
+    return service
+
+def test_record_query_updates_counters():
+    service = make_service()
+    service.record_query({"id": "q1", "status": "answered", "confidence_score": 0.9, "created_at": "2024-03-01T10:00:00"})
+    service.record_query({"id": "q2", "status": "answered", "confidence_score": 0.3, "created_at": "2024-03-02T10:00:00"})
+
+    summary = service.get_summary()
+    assert summary["total_queries"] == 2
+    assert summary["queries_by_status"] == {"answered": 2}
+    assert summary["average_confidence"] == 0.6
+    assert summary["confidence_histogram"]["0.9-1.0"] == 1
+    assert summary["confidence_histogram"]["0.3-0.4"] == 1
+    assert [day["date"] for day in summary["daily"]] == ["2024-03-01", "2024-03-02"]
+
+def test_flag_and_resolution_are_counted_once():
+    service = make_service()
+    service.record_query({"id": "q1", "status": "answered", "confidence_score": 0.3, "created_at": "2024-03-01T10:00:00"})
+    feedback = {"id": "f1", "query_id": "q1", "status": "pending", "created_at": "2024-03-01T11:00:00"}
+    service.record_flag("q1", feedback)
+    service.record_flag("q1", {**feedback, "id": "f2"})
+
+    summary = service.get_summary()
+    assert summary["queries_by_status"] == {"answered": 0, "flagged": 1}
+    assert summary["flag_rate"] == 1.0
+    assert summary["feedback_by_status"] == {"pending": 2}
+
+    resolved = {**feedback, "status": "addressed", "updated_at": "2024-03-01T11:30:00"}
+    service.record_resolution(resolved)
+    service.record_resolution(resolved)
+
+    summary = service.get_summary()
+    assert summary["feedback_by_status"] == {"pending": 1, "addressed": 1}
+    assert summary["average_resolution_seconds"] == 1800
+    assert summary["resolution_histogram"]["<1h"] == 1
+
+def test_flag_moves_query_out_of_its_actual_status():
+    service = make_service()
+    service.record_query({"id": "q1", "status": "pending", "confidence_score": None, "created_at": "2024-03-01T10:00:00"})
+    service.record_query({"id": "q2", "status": "answered", "confidence_score": 0.9, "created_at": "2024-03-01T10:00:00"})
+    service.record_flag("q1", {"id": "f1", "query_id": "q1", "status": "pending", "created_at": "2024-03-01T11:00:00"})
+
+    assert service.get_summary()["queries_by_status"] == {"pending": 0, "answered": 1, "flagged": 1}
+
+def test_daily_history_is_ordered_and_bounded(monkeypatch):
+    monkeypatch.setattr(analytics_service, "DAILY_HISTORY_DAYS", 3)
+    service = make_service()
+    for day in ["2024-03-05", "2024-03-02", "2024-03-04", "2024-03-06", "2024-03-01"]:
+        service.record_query({"id": day, "status": "answered", "confidence_score": 0.5, "created_at": f"{day}T10:00:00"})
+
+    summary = service.get_summary(days=2)
+    assert [day["date"] for day in summary["daily"]] == ["2024-03-05", "2024-03-06"]
+    assert service.days == ["2024-03-04", "2024-03-05", "2024-03-06"]
+    assert summary["total_queries"] == 5
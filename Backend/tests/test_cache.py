@@ -0,0 +1,40 @@
+import time
+import app.server
+from app.core.cache import TTLCache
+from app.core.shared_state import SharedStateManager
+from app.server import SharedStateServer
+
+def test_entries_expire():
+    cache = TTLCache()
+    cache.set("key", "value", ttl=0.05)
+    assert cache.get("key") == "value"
+    time.sleep(0.1)
+    assert cache.get("key") is None
+
+def test_least_recently_used_entry_is_evicted():
+    cache = TTLCache(max_entries=2)
+    cache.set("a", 1, ttl=60)
+    cache.set("b", 2, ttl=60)
+    cache.get("a")
+    cache.set("c", 3, ttl=60)
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+    assert cache.get("c") == 3
+
+def _start_cache_only():
+    app.server._cache = TTLCache()
+
+def test_workers_share_cache_through_state_server():
+    server = SharedStateServer(address=("127.0.0.1", 0), authkey=b"test")
+    server.start(initializer=_start_cache_only)
+    try:
+        workers = []
+        for _ in range(2):
+            manager = SharedStateManager(address=server.address, authkey=b"test")
+            manager.connect()
+            workers.append(manager.cache())
+
+        workers[0].set("answer:hello", ("Hi there", 0.9), 60)
+        assert workers[1].get("answer:hello") == ("Hi there", 0.9)
+    finally:
+        server.shutdown()
@@ -0,0 +1,46 @@
+from types import SimpleNamespace
+import time
+from fastapi.testclient import TestClient
+from app.core import container
+from app.core.container import ServiceContainer
+from app.main import app
+
+class FakeAuth:
+    def get_user(self, token):
+        return SimpleNamespace(user=SimpleNamespace(
+            id="u1", email="student@sfsu.edu", user_metadata={"role": "student"}, last_sign_in_at=None
+        ))
+
+def wait_for_status(client, expected):
+    deadline = time.monotonic() + 5
+    while time.monotonic() < deadline:
+        response = client.get("/ready")
+        if response.json()["status"] == expected:
+            return response
+        time.sleep(0.01)
+    raise AssertionError(f"/ready never reported {expected}")
+
+def test_auth_is_served_while_failed_warm_up_retries(monkeypatch):
+    monkeypatch.setattr(container, "WARM_UP_RETRY_SECONDS", 0.05)
+    monkeypatch.setattr(ServiceContainer, "supabase", SimpleNamespace(auth=FakeAuth()))
+    broken = {"knowledge_base": True}
+    def warm_up_services(self):
+        if broken["knowledge_base"]:
+            raise RuntimeError("mock_responses.json is empty")
+    monkeypatch.setattr(ServiceContainer, "_warm_up_services", warm_up_services)
+
+    with TestClient(app) as client:
+        failed = wait_for_status(client, "failed")
+        assert failed.status_code == 503
+        assert "mock_responses.json is empty" in failed.json()["detail"]
+
+        # Auth only needs the Supabase client and the token cache
+        headers = {"Authorization": "Bearer token"}
+        assert client.get("/api/auth/me", headers=headers).status_code == 200
+
+        submitted = client.post("/api/queries/submit", json={"query_text": "When is tuition due?"}, headers=headers)
+        assert submitted.status_code == 503
+
+        broken["knowledge_base"] = False
+        assert wait_for_status(client, "ready").status_code == 200
+    del app.state.services
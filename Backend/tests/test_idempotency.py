@@ -0,0 +1,98 @@
+import asyncio
+import pytest
+from fastapi import HTTPException
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.idempotency import IdempotencyStore
+
+class CountingOperation:
+    def __init__(self, delay: float = 0, fail: bool = False):
+        self.calls = 0
+        self.delay = delay
+        self.fail = fail
+
+    async def __call__(self):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        if self.fail:
+            raise RuntimeError("LLM unavailable")
+        return {"id": f"q{self.calls}"}
+
+def test_completed_key_is_replayed():
+    store = IdempotencyStore(TTLCache())
+    operation = CountingOperation()
+
+    async def scenario():
+        first = await store.run("u1", "submit_query", "key-1", "body", operation)
+        retry = await store.run("u1", "submit_query", "key-1", "body", operation)
+        other_user = await store.run("u2", "submit_query", "key-1", "body", operation)
+        return first, retry, other_user
+
+    first, retry, other_user = asyncio.run(scenario())
+    assert first == ({"id": "q1"}, False)
+    assert retry == ({"id": "q1"}, True)
+    assert other_user == ({"id": "q2"}, False)
+
+def test_retry_waits_for_attempt_in_progress():
+    store = IdempotencyStore(TTLCache())
+    operation = CountingOperation(delay=0.2)
+
+    async def scenario():
+        return await asyncio.gather(
+            store.run("u1", "submit_query", "key-1", "body", operation),
+            store.run("u1", "submit_query", "key-1", "body", operation),
+        )
+
+    results = asyncio.run(scenario())
+    assert operation.calls == 1
+    assert sorted(replayed for _, replayed in results) == [False, True]
+    assert results[0][0] == results[1][0]
+
+def test_claim_is_renewed_while_attempt_outlasts_it(monkeypatch):
+    monkeypatch.setattr(settings, "IDEMPOTENCY_LOCK_SECONDS", 0.1)
+    store = IdempotencyStore(TTLCache())
+    operation = CountingOperation(delay=0.35)
+
+    async def scenario():
+        first = asyncio.create_task(store.run("u1", "submit_query", "key-1", "body", operation))
+        # Well past the first claim's expiry
+        await asyncio.sleep(0.2)
+        retry = await store.run("u1", "submit_query", "key-1", "body", operation)
+        return await first, retry
+
+    first, retry = asyncio.run(scenario())
+    assert operation.calls == 1
+    assert first == ({"id": "q1"}, False)
+    assert retry == ({"id": "q1"}, True)
+
+def test_attempt_that_lost_its_claim_does_not_overwrite_it():
+    cache = TTLCache()
+    store = IdempotencyStore(cache)
+    cache_key = "idempotency:u1:submit_query:key-1"
+
+    async def lose_claim():
+        # As if the claim expired and a retry claimed the key in the meantime
+        cache.set(cache_key, {"state": "in_progress", "fingerprint": "body", "attempt": "retry"}, 60)
+        return {"id": "q1"}
+
+    result = asyncio.run(store.run("u1", "submit_query", "key-1", "body", lose_claim))
+    assert result == ({"id": "q1"}, False)
+    assert cache.get(cache_key)["attempt"] == "retry"
+
+def test_failed_attempt_releases_key():
+    store = IdempotencyStore(TTLCache())
+    failing = CountingOperation(fail=True)
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(store.run("u1", "submit_query", "key-1", "body", failing))
+
+    result = asyncio.run(store.run("u1", "submit_query", "key-1", "body", CountingOperation()))
+    assert result == ({"id": "q1"}, False)
+
+def test_key_reused_for_different_request_is_rejected():
+    store = IdempotencyStore(TTLCache())
+    asyncio.run(store.run("u1", "submit_query", "key-1", "body", CountingOperation()))
+
+    with pytest.raises(HTTPException) as error:
+        asyncio.run(store.run("u1", "submit_query", "key-1", "other body", CountingOperation()))
+    assert error.value.status_code == 422
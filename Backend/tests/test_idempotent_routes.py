@@ -0,0 +1,111 @@
+from collections import defaultdict
+from types import SimpleNamespace
+import pytest
+from fastapi.testclient import TestClient
+from app.main import app
+from app.core.cache import TTLCache
+from app.core.container import ServiceContainer
+from app.core.idempotency import IdempotencyStore
+from app.core.security import get_current_user
+from app.services.analytics_service import AnalyticsService
+from app.services.feedback_service import FeedbackService
+from app.services.llm_service import LLMService
+from app.services.query_service import QueryService
+from app.services.search_service import SearchService
+
+class FakeTable:
+    """Just enough of a Supabase table to insert and update rows"""
+
+    def __init__(self, name: str, inserted: list):
+        self.name = name
+        self.inserted = inserted
+        self.rows = []
+
+    def insert(self, data):
+        self.inserted.append(data)
+        self.rows = [{**data, "id": f"{self.name}-{len(self.inserted)}"}]
+        return self
+
+    def update(self, data):
+        self.rows = [data]
+        return self
+
+    def eq(self, column, value):
+        return self
+
+    def execute(self):
+        return SimpleNamespace(data=self.rows)
+
+class FakeSupabase:
+    def __init__(self):
+        self.inserted = defaultdict(list)
+
+    def table(self, name: str) -> FakeTable:
+        return FakeTable(name, self.inserted[name])
+
+class FixedLLMService(LLMService):
+    def get_response(self, query: str):
+        return "Tuition is due in August.", 0.9
+
+@pytest.fixture
+def supabase():
+    # A container with stubbed storage, built without the lifespan warm-up
+    services = ServiceContainer()
+    services.supabase = FakeSupabase()
+    services.cache = TTLCache()
+    services.idempotency_store = IdempotencyStore(TTLCache())
+    services.analytics_service = AnalyticsService()
+    services.search_service = SearchService(services.supabase)
+    services.query_service = QueryService(
+        FixedLLMService(),
+        services.supabase,
+        services.analytics_service,
+        services.search_service,
+        services.cache
+    )
+    services.feedback_service = FeedbackService(services.supabase, services.analytics_service)
+    services.core_ready.set()
+    services.ready.set()
+
+    app.state.services = services
+    app.dependency_overrides[get_current_user] = lambda: SimpleNamespace(id="u1", user_metadata={"role": "student"})
+    yield services.supabase
+    app.dependency_overrides.clear()
+    del app.state.services
+
+def test_submit_query_with_same_key_inserts_once(supabase):
+    client = TestClient(app)
+    headers = {"Idempotency-Key": "key-1"}
+
+    first = client.post("/api/queries/submit", json={"query_text": "When is tuition due?"}, headers=headers)
+    retry = client.post("/api/queries/submit", json={"query_text": "When is tuition due?"}, headers=headers)
+
+    assert first.status_code == retry.status_code == 200
+    assert "Idempotent-Replayed" not in first.headers
+    assert retry.headers["Idempotent-Replayed"] == "true"
+    assert retry.json() == first.json()
+    assert len(supabase.inserted["queries"]) == 1
+
+def test_submit_query_without_key_is_not_deduplicated(supabase):
+    client = TestClient(app)
+    for _ in range(2):
+        response = client.post("/api/queries/submit", json={"query_text": "When is tuition due?"})
+        assert "Idempotent-Replayed" not in response.headers
+    assert len(supabase.inserted["queries"]) == 2
+
+def test_flag_response_with_same_key_is_deduplicated(supabase):
+    client = TestClient(app)
+    body = {"query_id": "queries-1", "feedback_text": "The deadline is wrong"}
+
+    first = client.post("/api/feedback/flag-response", json=body, headers={"Idempotency-Key": "flag-1"})
+    retry = client.post("/api/feedback/flag-response", json=body, headers={"Idempotency-Key": "flag-1"})
+    reused = client.post(
+        "/api/feedback/flag-response",
+        json={**body, "feedback_text": "Something else"},
+        headers={"Idempotency-Key": "flag-1"}
+    )
+
+    assert retry.headers["Idempotent-Replayed"] == "true"
+    assert retry.json() == first.json()
+    assert reused.status_code == 422
+    assert len(supabase.inserted["feedback"]) == 1
@@ -11,4 +11,10 @@ def test_read_root():
 def test_health_check():
     response = client.get("/health")
     assert response.status_code == 200
-    assert response.json() == {"status": "healthy"} 
\ No newline at end of file
+    assert response.json() == {"status": "healthy"} 
+
+def test_ready_before_startup():
+    # Without the lifespan (no `with TestClient(app)`) no services are built
+    response = client.get("/ready")
+    assert response.status_code == 503
+    assert response.json() == {"status": "starting"}
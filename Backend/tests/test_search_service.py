@@ -0,0 +1,61 @@
+from datetime import date
+from types import SimpleNamespace
+import pytest
+from app.services.search_service import SearchService, decode_cursor, encode_cursor
+
+class FakeSupabase:
+    """Records search_queries() calls and returns canned rows"""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.calls = []
+
+    def rpc(self, function, params):
+        self.calls.append((function, params))
+        return SimpleNamespace(execute=lambda: SimpleNamespace(data=self.rows[:params["page_size"]]))
+
+def make_rows(count):
+    return [{"id": f"q{index}", "query_text": "Tuition deadline", "rank": 1.0 / (index + 1)} for index in range(count)]
+
+def test_search_passes_filters_to_database():
+    supabase = FakeSupabase(make_rows(1))
+    SearchService(supabase).search(
+        "tuition deadline",
+        status="flagged",
+        created_from=date(2024, 3, 1),
+        created_to=date(2024, 3, 31),
+        max_confidence=0.5,
+        limit=10
+    )
+    assert supabase.calls == [("search_queries", {
+        "search_text": "tuition deadline",
+        "query_status": "flagged",
+        "created_from": "2024-03-01",
+        "created_to": "2024-03-31",
+        "max_confidence": 0.5,
+        "after_rank": None,
+        "after_id": None,
+        "page_size": 11,
+    })]
+
+def test_cursor_continues_after_last_hit():
+    supabase = FakeSupabase(make_rows(3))
+    service = SearchService(supabase)
+
+    first = service.search("tuition", limit=2)
+    assert [hit["id"] for hit in first["hits"]] == ["q0", "q1"]
+    assert decode_cursor(first["next_cursor"]) == (0.5, "q1")
+
+    service.search("tuition", limit=2, cursor=first["next_cursor"])
+    assert supabase.calls[-1][1]["after_rank"] == 0.5
+    assert supabase.calls[-1][1]["after_id"] == "q1"
+
+def test_last_page_has_no_cursor():
+    found = SearchService(FakeSupabase(make_rows(2))).search("tuition", limit=2)
+    assert len(found["hits"]) == 2
+    assert found["next_cursor"] is None
+
+def test_invalid_cursor_is_rejected():
+    with pytest.raises(ValueError):
+        SearchService(FakeSupabase([])).search("tuition", cursor="not-a-cursor")
+    assert decode_cursor(encode_cursor(0.25, "q9")) == (0.25, "q9")
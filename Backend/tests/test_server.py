@@ -0,0 +1,10 @@
+import socket
+from app.server import WorkerConfig
+
+def test_worker_socket_connections_get_tcp_nodelay():
+    # asyncio only sets TCP_NODELAY on connections from IPPROTO_TCP sockets
+    sock = WorkerConfig("app.main:app", host="127.0.0.1", port=0, workers=2).bind_socket()
+    try:
+        assert sock.proto == socket.IPPROTO_TCP
+    finally:
+        sock.close()